@@ -1,4 +1,5 @@
 ﻿# app.py
+import click
 from flask import Flask, redirect, url_for, render_template
 from flask_login import current_user, login_required
 from werkzeug.middleware.proxy_fix import ProxyFix
@@ -10,6 +11,8 @@ from extensions import db, login_manager, csrf
 
 from auth import auth_bp
 from cadastro import cadastro_bp
+from profiler import profiler_bp, init_profiler
+from contadores import init_contadores
 
 
 def _seed_default_admin():
@@ -30,6 +33,27 @@ def _seed_default_admin():
         db.session.rollback()
 
 
+def _add_version_columns():
+    # create_all não altera tabelas já existentes: bancos anteriores ao
+    # controle de versão ganham a coluna version_id aqui.
+    insp = db.inspect(db.engine)
+    for tabela in ("users", "horarios", "mensalidades"):
+        colunas = {c["name"] for c in insp.get_columns(tabela)}
+        if "version_id" not in colunas:
+            with db.engine.begin() as conn:
+                conn.execute(db.text(f"ALTER TABLE {tabela} ADD COLUMN version_id INTEGER NOT NULL DEFAULT 1"))
+
+
+def _seed_contadores():
+    from models import Contador
+    from contadores import reconciliar_contadores
+    try:
+        if db.session.scalar(db.select(Contador.chave).limit(1)) is None:
+            reconciliar_contadores()
+    except Exception:
+        db.session.rollback()
+
+
 def create_app():
     app = Flask(__name__, template_folder="templates", static_folder="static")
     app.wsgi_app = ProxyFix(app.wsgi_app, x_for=1, x_proto=1, x_host=1, x_port=1)
@@ -43,6 +67,9 @@ def create_app():
 
     app.register_blueprint(auth_bp)                         # /login, /logout, /home
     app.register_blueprint(cadastro_bp, url_prefix="/cadastro")
+    app.register_blueprint(profiler_bp)                     # /admin/perfis
+    init_profiler(app)
+    init_contadores(app)
 
     @app.route("/")
     def index():
@@ -79,9 +106,41 @@ def create_app():
         except TemplateNotFound:
             return "500 - Erro interno", 500
 
+    # Geração de cobranças: flask --app wsgi gerar-cobrancas 2025-03
+    @app.cli.command("gerar-cobrancas")
+    @click.argument("competencia")
+    def gerar_cobrancas_cmd(competencia):
+        from cobranca import gerar_cobrancas
+        try:
+            total = gerar_cobrancas(competencia)
+        except ValueError as e:
+            raise click.BadParameter(str(e))
+        click.echo(f"{total} cobrança(s) gerada(s) para {competencia}.")
+
+    # Grade semanal: flask --app wsgi gerar-grade --tempo-limite 30
+    @app.cli.command("gerar-grade")
+    @click.option("--tempo-limite", default=10.0, show_default=True, help="Segundos de busca.")
+    def gerar_grade_cmd(tempo_limite):
+        from grade import gerar_grade, GradeInviavel
+        try:
+            total = gerar_grade(tempo_limite=tempo_limite)
+        except GradeInviavel as e:
+            raise click.ClickException(str(e))
+        click.echo(f"Grade gerada com {total} aula(s).")
+
+    # Reconciliação periódica dos contadores da home (ex.: cron a cada hora):
+    # flask --app wsgi reconciliar-contadores
+    @app.cli.command("reconciliar-contadores")
+    def reconciliar_contadores_cmd():
+        from contadores import reconciliar_contadores
+        total = reconciliar_contadores()
+        click.echo(f"{total} contador(es) recalculado(s).")
+
     with app.app_context():
         db.create_all()
+        _add_version_columns()
         _seed_default_admin()
+        _seed_contadores()
         # Loga o mapa de rotas para debug
         app.logger.info("Rotas: %s", [r.rule for r in app.url_map.iter_rules()])
 
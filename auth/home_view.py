@@ -1,10 +1,12 @@
 # auth/home_view.py
-from flask import render_template
+from flask import render_template, current_app
 from flask_login import login_required
 from . import auth_bp
 
 @auth_bp.route("/home", endpoint="home")
 @login_required
 def home():
-    # Renderiza a sua home. Se já tiver um template próprio, troque o nome abaixo.
-    return render_template("home.html")
+    # Totais vêm da tabela contadores (mantida incrementalmente), não de COUNT/SUM
+    from contadores import ler_contadores
+    painel = ler_contadores(ttl=current_app.config.get("CONTADORES_CACHE_TTL", 30))
+    return render_template("home.html", painel=painel)
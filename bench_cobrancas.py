@@ -0,0 +1,58 @@
+# bench_cobrancas.py
+# Benchmark da geração de cobranças: 10k alunos x 12 competências.
+# Uso: python bench_cobrancas.py [n_alunos]
+import os
+import sys
+import tempfile
+import time
+from decimal import Decimal
+
+_db_path = os.path.join(tempfile.mkdtemp(), "bench.db")
+os.environ["DATABASE_URL"] = f"sqlite:///{_db_path}"
+
+from app import app  # noqa: E402
+from extensions import db  # noqa: E402
+from models import Aluno, Matricula, Mensalidade, Cobranca  # noqa: E402
+from cobranca import gerar_cobrancas  # noqa: E402
+
+SERIES = [f"{i}º Ano" for i in range(1, 10)]
+
+
+def popular(n_alunos: int) -> None:
+    db.session.execute(
+        db.insert(Mensalidade),
+        [{"serie": s, "valor": Decimal("500.00") + i * 50} for i, s in enumerate(SERIES)],
+    )
+    db.session.execute(db.insert(Aluno), [{"nome": f"Aluno {i}"} for i in range(n_alunos)])
+    db.session.execute(
+        db.insert(Matricula),
+        [{"aluno_id": i + 1, "serie": SERIES[i % len(SERIES)], "ativa": True} for i in range(n_alunos)],
+    )
+    db.session.commit()
+
+
+def main() -> None:
+    n_alunos = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    with app.app_context():
+        popular(n_alunos)
+        competencias = [f"2025-{m:02d}" for m in range(1, 13)]
+
+        t0 = time.perf_counter()
+        total = sum(gerar_cobrancas(c) for c in competencias)
+        gerar = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        repetido = sum(gerar_cobrancas(c) for c in competencias)
+        rerun = time.perf_counter() - t0
+
+        assert total == n_alunos * 12, total
+        assert repetido == 0, repetido
+        assert db.session.scalar(db.select(db.func.count(Cobranca.id))) == total
+
+        print(f"alunos={n_alunos} cobrancas={total}")
+        print(f"geracao: {gerar:.3f}s ({gerar / 12 * 1000:.1f} ms/competencia)")
+        print(f"reexecucao (idempotente): {rerun:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
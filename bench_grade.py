@@ -0,0 +1,70 @@
+# bench_grade.py
+# Benchmark do montador de grade: escola cheia, 6 aulas por dia (30 por semana).
+# Uso: python bench_grade.py [n_turmas]
+import random
+import sys
+import time
+
+from grade import resolver_grade
+
+N_HORARIOS = 6
+AULAS_SEMANA = 5 * N_HORARIOS
+DISCIPLINAS = 6        # 6 disciplinas x 5 aulas = grade cheia por turma
+TURMAS_POR_PROFESSOR = 6
+
+
+def cargas_simetricas(n_turmas: int):
+    """Cada professor pega um bloco de 6 turmas na mesma disciplina."""
+    return [
+        (t, d * 1000 + t // TURMAS_POR_PROFESSOR, 5)
+        for t in range(n_turmas)
+        for d in range(DISCIPLINAS)
+    ]
+
+
+def cargas_irregulares(n_turmas: int, seed: int, teto: int):
+    """Disciplinas de 2 a 6 aulas e professores sorteados, cada um com até `teto` aulas."""
+    rnd = random.Random(seed)
+    livre = {}   # professor -> aulas ainda disponíveis
+    cargas = []
+    for t in range(n_turmas):
+        falta = AULAS_SEMANA
+        while falta:
+            n = min(falta, rnd.randint(2, 6))
+            candidatos = [p for p, c in livre.items() if c >= n]
+            if not candidatos or rnd.random() < 0.15:
+                p = len(livre)
+                livre[p] = teto
+            else:
+                p = rnd.choice(candidatos)
+            livre[p] -= n
+            cargas.append((t, p, n))
+            falta -= n
+    return cargas
+
+
+def rodar(nome: str, cargas) -> None:
+    t0 = time.perf_counter()
+    solucao = resolver_grade(cargas, N_HORARIOS, tempo_limite=60)
+    tempo = time.perf_counter() - t0
+
+    ocupado = set()
+    for t, p, s in solucao:
+        assert ("t", t, s) not in ocupado and ("p", p, s) not in ocupado
+        ocupado.update({("t", t, s), ("p", p, s)})
+    assert len(solucao) == sum(n for _, _, n in cargas)
+
+    print(f"{nome:<24} aulas={len(solucao)} professores={len({p for _, p, _ in cargas})} "
+          f"resolucao: {tempo:.3f}s")
+
+
+def main() -> None:
+    n_turmas = int(sys.argv[1]) if len(sys.argv) > 1 else 36
+    rodar(f"simetrica turmas={n_turmas}", cargas_simetricas(n_turmas))
+    for teto in (30, 26):
+        for seed in range(3):
+            rodar(f"irregular teto={teto} s={seed}", cargas_irregulares(n_turmas, seed, teto))
+
+
+if __name__ == "__main__":
+    main()
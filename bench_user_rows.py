@@ -0,0 +1,64 @@
+# bench_user_rows.py
+# Compara a listagem de usuários carregando User (ORM completo) x UserRow (projeção).
+# Uso: python bench_user_rows.py [n_usuarios]
+import gc
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+_db_path = os.path.join(tempfile.mkdtemp(), "bench.db")
+os.environ["DATABASE_URL"] = f"sqlite:///{_db_path}"
+
+from app import app  # noqa: E402
+from extensions import db  # noqa: E402
+from models import User, UserRow  # noqa: E402
+
+
+def popular(n: int) -> None:
+    # Hash fixo: o custo de gerar hashes não interessa aqui, só o tamanho da coluna.
+    hash_fake = "scrypt:32768:8:1$" + "x" * 140
+    db.session.execute(
+        db.insert(User),
+        [
+            {"name": f"Usuário {i}", "email": f"u{i}@school.com", "password_hash": hash_fake,
+             "role": "Colaborador", "is_active": bool(i % 7)}
+            for i in range(n)
+        ],
+    )
+    db.session.commit()
+
+
+def medir(nome, carregar, n):
+    db.session.expunge_all()
+    gc.collect()
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    linhas = carregar()
+    tempo = time.perf_counter() - t0
+    memoria, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert len(linhas) == n
+    print(f"{nome:<8} {tempo * 1000:8.1f} ms  {memoria / n:8.0f} B/linha")
+    del linhas
+    db.session.expunge_all()
+    return tempo, memoria
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    with app.app_context():
+        popular(n)
+        print(f"usuarios={n}")
+        orm_t, orm_m = medir(
+            "User", lambda: db.session.scalars(db.select(User).order_by(User.created_at.desc())).all(), n,
+        )
+        row_t, row_m = medir(
+            "UserRow", lambda: UserRow.fetch(UserRow.select().order_by(User.created_at.desc())), n,
+        )
+        print(f"ganho: {orm_t / row_t:.1f}x tempo, {orm_m / row_m:.1f}x memoria")
+
+
+if __name__ == "__main__":
+    main()
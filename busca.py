@@ -0,0 +1,36 @@
+# busca.py
+import time
+from collections import OrderedDict
+
+from flask import current_app
+
+from models import User, UserRow
+
+# Cache curto por consulta: (termo, limite) -> (expira, linhas). As linhas são
+# tuplas imutáveis (UserRow), então podem ser compartilhadas entre requisições.
+_cache = OrderedDict()
+_MAX_ENTRADAS = 256
+
+
+def buscar_usuarios(q: str, limite: int) -> list:
+    chave = (q.lower(), limite)
+    ttl = current_app.config.get("BUSCA_CACHE_TTL", 5.0)
+    agora = time.monotonic()
+
+    item = _cache.get(chave)
+    if item is not None and item[0] > agora:
+        _cache.move_to_end(chave)
+        return item[1]
+
+    stmt = UserRow.select()
+    if q:
+        like = f"%{q}%"
+        stmt = stmt.where((User.name.ilike(like)) | (User.email.ilike(like)))
+    linhas = UserRow.fetch(stmt.order_by(User.name.asc()).limit(limite))
+
+    if ttl > 0:
+        _cache[chave] = (agora + ttl, linhas)
+        _cache.move_to_end(chave)
+        while len(_cache) > _MAX_ENTRADAS:
+            _cache.popitem(last=False)
+    return linhas
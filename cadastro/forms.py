@@ -1,5 +1,5 @@
 from flask_wtf import FlaskForm
-from wtforms import StringField, PasswordField, SelectField, BooleanField, DecimalField, SubmitField
+from wtforms import StringField, PasswordField, SelectField, BooleanField, DecimalField, HiddenField, SubmitField
 from wtforms.validators import DataRequired, Email, Length, Optional, Regexp, NumberRange
 
 ROLE_CHOICES = [
@@ -9,10 +9,12 @@ ROLE_CHOICES = [
 
 
 class UsuarioForm(FlaskForm):
+    name = StringField("Nome", validators=[DataRequired(), Length(max=120)])
     email = StringField("Email", validators=[DataRequired(), Email(), Length(max=255)])
     password = PasswordField("Senha (preencher para definir/alterar)", validators=[Optional(), Length(min=6, max=128)])
     role = SelectField("Perfil", choices=ROLE_CHOICES, validators=[DataRequired()])
     active = BooleanField("Ativo")
+    version_id = HiddenField()
     submit = SubmitField("Salvar")
 
 
@@ -26,10 +28,12 @@ class HorarioForm(FlaskForm):
         "Hora fim",
         validators=[DataRequired(), Regexp(r"^\d{2}:\d{2}$", message="Use o formato HH:MM")]
     )
+    version_id = HiddenField()
     submit = SubmitField("Salvar")
 
 
 class MensalidadeForm(FlaskForm):
     serie = StringField("Série", validators=[DataRequired(), Length(max=120)])
     valor = DecimalField("Valor", places=2, rounding=None, validators=[DataRequired(), NumberRange(min=0)])
+    version_id = HiddenField()
     submit = SubmitField("Salvar")
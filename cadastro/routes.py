@@ -1,11 +1,16 @@
 # cadastro/routes.py
 from functools import wraps
-from flask import render_template, request, redirect, url_for, flash
+from flask import render_template, request, redirect, url_for, flash, jsonify, current_app
 from flask_login import login_required, current_user
 
+from sqlalchemy.orm.exc import StaleDataError
+
 from . import cadastro_bp
+from .forms import UsuarioForm, HorarioForm, MensalidadeForm
 from extensions import db
-from models import User, Horario, Mensalidade, ROLE_DIRETORIA
+from concorrencia import versao_enviada, render_conflito
+from busca import buscar_usuarios
+from models import User, UserRow, Horario, Mensalidade, Turma, CargaHoraria, GradeAula, ROLE_DIRETORIA, ROLE_COLABORADOR
 
 # ---- helpers de permissão ----
 def diretoria_required(fn):
@@ -28,13 +33,36 @@ def diretoria_required(fn):
 @login_required
 def usuarios_list():
     q = request.args.get("q", "").strip()
-    query = User.query
+    stmt = UserRow.select()
     if q:
         like = f"%{q}%"
-        query = query.filter((User.name.ilike(like)) | (User.email.ilike(like)))
-    usuarios = query.order_by(User.name.asc()).all()
+        stmt = stmt.where((User.name.ilike(like)) | (User.email.ilike(like)))
+    usuarios = UserRow.fetch(stmt.order_by(User.name.asc()))
     return render_template("cadastro/usuarios_list.html", usuarios=usuarios, q=q)
 
+@cadastro_bp.route("/usuarios/busca", endpoint="usuarios_busca")
+@login_required
+def usuarios_busca():
+    """
+    Busca ao vivo da lista de usuários: devolve só as linhas da tabela
+    (ou JSON com ?formato=json), limitadas aos N primeiros por nome.
+    """
+    q = request.args.get("q", "").strip()
+    limite = min(request.args.get("limite", current_app.config.get("BUSCA_LIMITE", 20), type=int), 100)
+    limite = max(limite, 1)
+    # Busca um a mais só para saber se a lista foi cortada
+    usuarios = buscar_usuarios(q, limite + 1)
+    cortado = len(usuarios) > limite
+    usuarios = usuarios[:limite]
+    if request.args.get("formato") == "json":
+        resp = jsonify([
+            {"id": u.id, "name": u.name, "email": u.email, "role": u.role, "is_active": u.is_active}
+            for u in usuarios
+        ])
+        resp.headers["X-Resultados-Cortados"] = "1" if cortado else "0"
+        return resp
+    return render_template("cadastro/_usuarios_rows.html", usuarios=usuarios, cortado=cortado, limite=limite)
+
 @cadastro_bp.route("/usuarios/novo", methods=["GET", "POST"], endpoint="usuarios_incluir")
 @cadastro_bp.route("/usuarios/incluir", methods=["GET", "POST"])
 @login_required
@@ -54,14 +82,16 @@ def usuarios_incluir():
             flash("E-mail já cadastrado.", "warning")
             return redirect(url_for("cadastro.usuarios_incluir"))
 
-        u = User(name=name, email=email, role=role or "Colaborador", is_active=True)
+        u = User(name=name, email=email, role=role or "Colaborador", is_active=bool(request.form.get("active")))
         u.set_password(password)
         db.session.add(u)
         db.session.commit()
         flash("Usuário criado com sucesso.", "success")
         return redirect(url_for("cadastro.usuarios_list"))
 
-    return render_template("cadastro/usuarios_form.html", modo="incluir")
+    form = UsuarioForm()
+    form.active.data = True
+    return render_template("cadastro/usuarios_form.html", modo="incluir", form=form, titulo="Novo usuário")
 
 @cadastro_bp.route("/usuarios/<int:user_id>/editar", methods=["GET", "POST"], endpoint="usuarios_editar")
 @login_required
@@ -72,7 +102,20 @@ def usuarios_editar(user_id: int):
         name = request.form.get("name", "").strip()
         email = request.form.get("email", "").strip().lower()
         role = request.form.get("role", u.role).strip()
-        is_active = request.form.get("is_active") == "on"
+        # BooleanField "active" do UsuarioForm: só vem no POST quando marcado
+        is_active = bool(request.form.get("active"))
+        voltar = url_for("cadastro.usuarios_editar", user_id=user_id)
+
+        def conflito():
+            return render_conflito("Editar usuário", [
+                ("Nome", name, u.name),
+                ("E-mail", email, u.email),
+                ("Perfil", role, u.role),
+                ("Ativo", is_active, u.is_active),
+            ], u.version_id, voltar)
+
+        if versao_enviada() != u.version_id:
+            return conflito()
 
         if not name or not email:
             flash("Preencha nome e e-mail.", "warning")
@@ -91,11 +134,17 @@ def usuarios_editar(user_id: int):
         if new_password:
             u.set_password(new_password)
 
-        db.session.commit()
+        try:
+            db.session.commit()
+        except StaleDataError:
+            db.session.rollback()
+            return conflito()
         flash("Usuário atualizado.", "success")
         return redirect(url_for("cadastro.usuarios_list"))
 
-    return render_template("cadastro/usuarios_form.html", modo="editar", usuario=u)
+    form = UsuarioForm(obj=u)
+    form.active.data = u.is_active
+    return render_template("cadastro/usuarios_form.html", modo="editar", usuario=u, form=form, titulo="Editar usuário")
 
 @cadastro_bp.route("/usuarios/<int:user_id>/excluir", methods=["POST"], endpoint="usuarios_excluir")
 @login_required
@@ -139,7 +188,7 @@ def horarios_incluir():
         flash("Horário criado.", "success")
         return redirect(url_for("cadastro.horarios_list"))
 
-    return render_template("cadastro/horarios_form.html", modo="incluir")
+    return render_template("cadastro/horario_form.html", modo="incluir", form=HorarioForm(), title="Novo horário")
 
 @cadastro_bp.route("/horarios/<int:hid>/editar", methods=["GET", "POST"], endpoint="horarios_editar")
 @login_required
@@ -150,17 +199,31 @@ def horarios_editar(hid: int):
         h_ini = request.form.get("hora_inicio", "").strip()
         h_fim = request.form.get("hora_fim", "").strip()
 
+        def conflito():
+            return render_conflito("Editar horário", [
+                ("Hora início", h_ini, h.hora_inicio),
+                ("Hora fim", h_fim, h.hora_fim),
+            ], h.version_id, url_for("cadastro.horarios_editar", hid=hid))
+
+        if versao_enviada() != h.version_id:
+            return conflito()
+
         if not h_ini or not h_fim:
             flash("Preencha Hora início e Hora fim.", "warning")
             return redirect(url_for("cadastro.horarios_editar", hid=hid))
 
         h.hora_inicio = h_ini
         h.hora_fim = h_fim
-        db.session.commit()
+        try:
+            db.session.commit()
+        except StaleDataError:
+            db.session.rollback()
+            return conflito()
         flash("Horário atualizado.", "success")
         return redirect(url_for("cadastro.horarios_list"))
 
-    return render_template("cadastro/horarios_form.html", modo="editar", horario=h)
+    return render_template("cadastro/horario_form.html", modo="editar", horario=h,
+                           form=HorarioForm(obj=h), title="Editar horário")
 
 @cadastro_bp.route("/horarios/<int:hid>/excluir", methods=["POST"], endpoint="horarios_excluir")
 @login_required
@@ -208,7 +271,7 @@ def mensalidade_incluir():
         flash("Mensalidade criada.", "success")
         return redirect(url_for("cadastro.mensalidade_list"))
 
-    return render_template("cadastro/mensalidade_form.html", modo="incluir")
+    return render_template("cadastro/mensalidade_form.html", modo="incluir", form=MensalidadeForm(), title="Nova mensalidade")
 
 @cadastro_bp.route("/mensalidades/<int:mid>/editar", methods=["GET", "POST"], endpoint="mensalidade_editar")
 @login_required
@@ -218,6 +281,16 @@ def mensalidade_editar(mid: int):
     if request.method == "POST":
         serie = request.form.get("serie", "").strip()
         valor_str = request.form.get("valor", "").strip().replace(",", ".")
+
+        def conflito():
+            return render_conflito("Editar mensalidade", [
+                ("Série", serie, m.serie),
+                ("Valor", valor_str, f"{m.valor:.2f}"),
+            ], m.version_id, url_for("cadastro.mensalidade_editar", mid=mid))
+
+        if versao_enviada() != m.version_id:
+            return conflito()
+
         if not serie or not valor_str:
             flash("Preencha Série e Valor.", "warning")
             return redirect(url_for("cadastro.mensalidade_editar", mid=mid))
@@ -231,11 +304,16 @@ def mensalidade_editar(mid: int):
 
         m.serie = serie
         m.valor = valor
-        db.session.commit()
+        try:
+            db.session.commit()
+        except StaleDataError:
+            db.session.rollback()
+            return conflito()
         flash("Mensalidade atualizada.", "success")
         return redirect(url_for("cadastro.mensalidade_list"))
 
-    return render_template("cadastro/mensalidade_form.html", modo="editar", mensalidade=m)
+    return render_template("cadastro/mensalidade_form.html", modo="editar", mensalidade=m,
+                           form=MensalidadeForm(obj=m), title="Editar mensalidade")
 
 @cadastro_bp.route("/mensalidades/<int:mid>/excluir", methods=["POST"], endpoint="mensalidade_excluir")
 @login_required
@@ -246,3 +324,78 @@ def mensalidade_excluir(mid: int):
     db.session.commit()
     flash("Mensalidade excluída.", "success")
     return redirect(url_for("cadastro.mensalidade_list"))
+
+# =========================
+# Grade semanal
+# =========================
+@cadastro_bp.route("/grade", endpoint="grade")
+@login_required
+def grade_semanal():
+    from grade import DIAS_SEMANA
+    horarios = Horario.query.order_by(Horario.hora_inicio.asc()).all()
+    turmas = Turma.query.order_by(Turma.nome.asc()).all()
+    # turma_id -> {(dia, horario_id): aula}
+    grades = {t.id: {} for t in turmas}
+    for a in GradeAula.query.options(db.joinedload(GradeAula.professor)).all():
+        grades.setdefault(a.turma_id, {})[(a.dia_semana, a.horario_id)] = a
+    cargas = CargaHoraria.query.order_by(CargaHoraria.turma_id.asc()).all()
+    professores = User.query.filter_by(is_active=True).order_by(User.name.asc()).all()
+    return render_template(
+        "cadastro/grade.html",
+        dias=DIAS_SEMANA, horarios=horarios, turmas=turmas, grades=grades,
+        cargas=cargas, professores=professores,
+    )
+
+@cadastro_bp.route("/grade/turmas/novo", methods=["POST"], endpoint="grade_turma_incluir")
+@login_required
+@diretoria_required
+def grade_turma_incluir():
+    nome = request.form.get("nome", "").strip()
+    if not nome:
+        flash("Informe o nome da turma.", "warning")
+    elif Turma.query.filter_by(nome=nome).first():
+        flash("Turma já cadastrada.", "warning")
+    else:
+        db.session.add(Turma(nome=nome))
+        db.session.commit()
+        flash("Turma criada.", "success")
+    return redirect(url_for("cadastro.grade"))
+
+@cadastro_bp.route("/grade/cargas/novo", methods=["POST"], endpoint="grade_carga_incluir")
+@login_required
+@diretoria_required
+def grade_carga_incluir():
+    try:
+        turma_id = int(request.form.get("turma_id", ""))
+        professor_id = int(request.form.get("professor_id", ""))
+        aulas = int(request.form.get("aulas_semanais", ""))
+    except ValueError:
+        flash("Preencha turma, professor e aulas por semana.", "warning")
+        return redirect(url_for("cadastro.grade"))
+
+    if db.session.get(Turma, turma_id) is None or db.session.get(User, professor_id) is None:
+        flash("Turma ou professor inexistente.", "warning")
+        return redirect(url_for("cadastro.grade"))
+
+    c = CargaHoraria.query.filter_by(turma_id=turma_id, professor_id=professor_id).first()
+    if c is None:
+        c = CargaHoraria(turma_id=turma_id, professor_id=professor_id)
+        db.session.add(c)
+    c.aulas_semanais = max(aulas, 0)
+    db.session.commit()
+    flash("Carga horária salva.", "success")
+    return redirect(url_for("cadastro.grade"))
+
+@cadastro_bp.route("/grade/gerar", methods=["POST"], endpoint="grade_gerar")
+@login_required
+@diretoria_required
+def grade_gerar():
+    from grade import gerar_grade, GradeInviavel
+    try:
+        total = gerar_grade()
+    except GradeInviavel as e:
+        db.session.rollback()
+        flash(str(e), "warning")
+    else:
+        flash(f"Grade gerada com {total} aula(s).", "success")
+    return redirect(url_for("cadastro.grade"))
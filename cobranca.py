@@ -0,0 +1,71 @@
+# cobranca.py
+import re
+from datetime import datetime
+
+from sqlalchemy import and_, exists, func, insert, literal, select
+
+from extensions import db
+from models import Cobranca, Matricula, Mensalidade
+
+_COMPETENCIA_RE = re.compile(r"^\d{4}-(0[1-9]|1[0-2])$")
+
+
+def validar_competencia(competencia: str) -> str:
+    competencia = (competencia or "").strip()
+    if not _COMPETENCIA_RE.match(competencia):
+        raise ValueError("Competência inválida; use o formato AAAA-MM.")
+    return competencia
+
+
+def gerar_cobrancas(competencia: str) -> int:
+    """
+    Gera as cobranças de uma competência (AAAA-MM) com um único
+    INSERT ... SELECT juntando matrículas ativas à tabela de mensalidades.
+
+    Idempotente: alunos que já têm cobrança na competência são ignorados,
+    então rodar de novo só cria o que faltou. Retorna o total inserido.
+    """
+    competencia = validar_competencia(competencia)
+
+    # Se houver mais de uma Mensalidade para a mesma série, vale a mais recente.
+    vigente = (
+        select(func.max(Mensalidade.id).label("id"))
+        .group_by(Mensalidade.serie)
+        .subquery()
+    )
+    # Um aluno com mais de uma matrícula ativa é cobrado pela mais recente.
+    matricula_vigente = (
+        select(func.max(Matricula.id).label("id"))
+        .where(Matricula.ativa.is_(True))
+        .group_by(Matricula.aluno_id)
+        .subquery()
+    )
+    ja_cobrado = exists().where(
+        and_(
+            Cobranca.aluno_id == Matricula.aluno_id,
+            Cobranca.competencia == competencia,
+        )
+    )
+
+    origem = (
+        select(
+            Matricula.aluno_id,
+            Matricula.id,
+            literal(competencia),
+            Matricula.serie,
+            Mensalidade.valor,
+            literal(datetime.utcnow()),
+        )
+        .join(Mensalidade, Mensalidade.serie == Matricula.serie)
+        .join(vigente, vigente.c.id == Mensalidade.id)
+        .join(matricula_vigente, matricula_vigente.c.id == Matricula.id)
+        .where(~ja_cobrado)
+    )
+
+    stmt = insert(Cobranca).from_select(
+        ["aluno_id", "matricula_id", "competencia", "serie", "valor", "created_at"],
+        origem,
+    )
+    result = db.session.execute(stmt)
+    db.session.commit()
+    return result.rowcount or 0
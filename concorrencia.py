@@ -0,0 +1,35 @@
+# concorrencia.py
+from flask import render_template, request
+
+# Campos do POST que não voltam no formulário de "manter minhas alterações"
+_NAO_REENVIAR = {"csrf_token", "version_id", "password", "submit"}
+
+
+def versao_enviada(valor=None):
+    """Versão que veio no campo oculto version_id do formulário (ou None)."""
+    if valor is None:
+        valor = request.form.get("version_id", "")
+    try:
+        return int(valor)
+    except (TypeError, ValueError):
+        return None
+
+
+def render_conflito(titulo: str, campos, versao_atual: int, voltar_url: str):
+    """
+    Tela de conflito de edição (HTTP 409). `campos` é uma lista de
+    (rótulo, valor enviado, valor atual no banco). O botão "manter minhas
+    alterações" reenvia o POST com a versão atual; "recarregar" descarta.
+    """
+    dados = [(k, v) for k, v in request.form.items(multi=True) if k not in _NAO_REENVIAR]
+    return render_template(
+        "conflito.html",
+        titulo=titulo,
+        campos=campos,
+        dados=dados,
+        versao_atual=versao_atual,
+        # A senha digitada não é devolvida na página; o usuário redigita se quiser mantê-la
+        senha_descartada=bool(request.form.get("password", "").strip()),
+        action_url=request.path,
+        voltar_url=voltar_url,
+    ), 409
@@ -25,6 +25,20 @@ class Config:
 
     SQLALCHEMY_TRACK_MODIFICATIONS = False
 
+    # Profiler por requisição (ver profiler/). Desligado => nenhum hook registrado.
+    PROFILER_ENABLED = os.getenv("PROFILER_ENABLED", "0") == "1"
+    PROFILER_SAMPLE_RATE = float(os.getenv("PROFILER_SAMPLE_RATE", "0") or 0)  # 0.01 = 1% das requisições
+    PROFILER_INTERVAL = 0.001  # segundos entre amostras
+    PROFILER_DIR = os.getenv("PROFILER_DIR", "/tmp/school-profiles")
+    PROFILER_MAX_FILES = int(os.getenv("PROFILER_MAX_FILES", "200") or 200)  # mais antigos são apagados
+
+    # Cache (segundos) dos contadores exibidos na home
+    CONTADORES_CACHE_TTL = float(os.getenv("CONTADORES_CACHE_TTL", "30") or 30)
+
+    # Busca ao vivo de usuários: máximo de linhas e validade (segundos) do cache por consulta
+    BUSCA_LIMITE = 20
+    BUSCA_CACHE_TTL = float(os.getenv("BUSCA_CACHE_TTL", "5") or 5)
+
     # Outras configs úteis
     SESSION_COOKIE_HTTPONLY = True
     REMEMBER_COOKIE_HTTPONLY = True
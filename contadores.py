@@ -0,0 +1,138 @@
+# contadores.py
+import time
+from collections import defaultdict
+from datetime import datetime
+from decimal import Decimal
+
+from sqlalchemy import event, func, inspect
+
+from extensions import db
+from models import Contador, Horario, Mensalidade, User
+
+HORARIOS = "horarios"
+USUARIOS_ATIVOS = "usuarios_ativos"
+MENSALIDADES_VALOR = "mensalidades_valor"
+
+# Cache do painel por processo; invalidado nos commits que mexem nos contadores.
+_cache = {"dados": None, "expira": 0.0}
+
+
+def _anterior(obj, campo):
+    """Valor do atributo antes das alterações pendentes na sessão."""
+    hist = inspect(obj).attrs[campo].history
+    if hist.deleted:
+        return hist.deleted[0]
+    return getattr(obj, campo)
+
+
+def _contribuicoes(obj, antes: bool):
+    """Pares (chave, valor) com que um objeto contribui para os contadores."""
+    valor = (lambda c: _anterior(obj, c)) if antes else (lambda c: getattr(obj, c))
+    if isinstance(obj, User):
+        if valor("is_active"):
+            return [(f"{USUARIOS_ATIVOS}:{valor('role')}", 1)]
+    elif isinstance(obj, Horario):
+        return [(HORARIOS, 1)]
+    elif isinstance(obj, Mensalidade):
+        return [(f"{MENSALIDADES_VALOR}:{valor('serie')}", Decimal(valor("valor") or 0))]
+    return []
+
+
+def _deltas(session):
+    deltas = defaultdict(Decimal)
+    for obj in session.new:
+        for chave, v in _contribuicoes(obj, antes=False):
+            deltas[chave] += v
+    for obj in session.deleted:
+        for chave, v in _contribuicoes(obj, antes=True):
+            deltas[chave] -= v
+    for obj in session.dirty:
+        if not isinstance(obj, (User, Mensalidade)) or not session.is_modified(obj):
+            continue
+        for chave, v in _contribuicoes(obj, antes=True):
+            deltas[chave] -= v
+        for chave, v in _contribuicoes(obj, antes=False):
+            deltas[chave] += v
+    return {k: v for k, v in deltas.items() if v}
+
+
+def _aplicar(conn, deltas):
+    tabela = Contador.__table__
+    agora = datetime.utcnow()
+    for chave, delta in deltas.items():
+        r = conn.execute(
+            tabela.update()
+            .where(tabela.c.chave == chave)
+            .values(valor=tabela.c.valor + delta, updated_at=agora)
+        )
+        if not r.rowcount:
+            conn.execute(tabela.insert().values(chave=chave, valor=delta, updated_at=agora))
+
+
+def _after_flush(session, flush_context):
+    deltas = _deltas(session)
+    if deltas:
+        _aplicar(session.connection(), deltas)
+        session.info["contadores_alterados"] = True
+
+
+def _after_commit(session):
+    if session.info.pop("contadores_alterados", False):
+        _cache["dados"] = None
+
+
+def _after_rollback(session, previous_transaction):
+    session.info.pop("contadores_alterados", None)
+
+
+def init_contadores(app):
+    """Liga a manutenção incremental dos contadores às escritas da sessão."""
+    if not event.contains(db.session, "after_flush", _after_flush):
+        event.listen(db.session, "after_flush", _after_flush)
+        event.listen(db.session, "after_commit", _after_commit)
+        event.listen(db.session, "after_soft_rollback", _after_rollback)
+
+
+def reconciliar_contadores() -> int:
+    """
+    Recalcula todos os contadores a partir das tabelas (COUNT/SUM).
+    Corrige desvios de escritas feitas fora do ORM (bulk insert, SQL manual).
+    """
+    valores = {HORARIOS: db.session.scalar(db.select(func.count(Horario.id))) or 0}
+    for role, n in db.session.execute(
+        db.select(User.role, func.count(User.id)).where(User.is_active.is_(True)).group_by(User.role)
+    ):
+        valores[f"{USUARIOS_ATIVOS}:{role}"] = n
+    for serie, total in db.session.execute(
+        db.select(Mensalidade.serie, func.sum(Mensalidade.valor)).group_by(Mensalidade.serie)
+    ):
+        valores[f"{MENSALIDADES_VALOR}:{serie}"] = total or 0
+
+    agora = datetime.utcnow()
+    db.session.execute(db.delete(Contador))
+    db.session.execute(
+        db.insert(Contador),
+        [{"chave": k, "valor": v, "updated_at": agora} for k, v in valores.items()],
+    )
+    db.session.commit()
+    _cache["dados"] = None
+    return len(valores)
+
+
+def ler_contadores(ttl: float = 30.0) -> dict:
+    """Painel da home: uma única leitura da tabela contadores, com cache de `ttl` segundos."""
+    agora = time.monotonic()
+    if _cache["dados"] is not None and agora < _cache["expira"]:
+        return _cache["dados"]
+
+    dados = {HORARIOS: 0, USUARIOS_ATIVOS: {}, MENSALIDADES_VALOR: {}}
+    for chave, valor in db.session.execute(db.select(Contador.chave, Contador.valor)):
+        grupo, _, nome = chave.partition(":")
+        if grupo == HORARIOS:
+            dados[HORARIOS] = int(valor)
+        elif grupo == USUARIOS_ATIVOS and valor:
+            dados[USUARIOS_ATIVOS][nome] = int(valor)
+        elif grupo == MENSALIDADES_VALOR and valor:
+            dados[MENSALIDADES_VALOR][nome] = valor
+    _cache.update(dados=dados, expira=agora + ttl)
+    return dados
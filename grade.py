@@ -0,0 +1,157 @@
+# grade.py
+import time
+
+from extensions import db
+from models import CargaHoraria, GradeAula, Horario
+
+DIAS_SEMANA = ["Segunda", "Terça", "Quarta", "Quinta", "Sexta"]
+
+
+class GradeInviavel(Exception):
+    """Não existe grade que atenda às cargas horárias cadastradas."""
+
+
+class TempoEsgotado(GradeInviavel):
+    """A busca estourou o tempo limite sem encontrar uma grade."""
+
+
+def resolver_grade(cargas, n_horarios: int, n_dias: int = len(DIAS_SEMANA), tempo_limite: float = 10.0):
+    """
+    Monta a grade semanal preenchendo a semana um slot por vez.
+
+    `cargas` é uma lista de (turma_id, professor_id, aulas_semanais). Os slots
+    são numerados dia a dia (slot = dia * n_horarios + horario). Em cada slot
+    é escolhido um emparelhamento turma x professor que cobre toda turma e
+    todo professor com tantas aulas restantes quanto slots restantes. Isso
+    mantém "carga <= slots restantes" para todos, então, se cada turma e cada
+    professor cabe na semana, a grade sempre fecha (teorema de König), sem
+    retrocesso.
+
+    Retorna uma lista de (turma_id, professor_id, slot).
+    """
+    n_slots = n_dias * n_horarios
+
+    restantes = {}   # (turma, professor) -> aulas que faltam
+    for t, p, n in cargas:
+        if n > 0:
+            restantes[(t, p)] = restantes.get((t, p), 0) + n
+    if not restantes:
+        return []
+
+    carga_turma, carga_prof = {}, {}
+    for (t, p), n in restantes.items():
+        carga_turma[t] = carga_turma.get(t, 0) + n
+        carga_prof[p] = carga_prof.get(p, 0) + n
+    if max(carga_turma.values()) > n_slots or max(carga_prof.values()) > n_slots:
+        raise GradeInviavel("Carga horária maior que o número de aulas da semana.")
+
+    dias_par = dict.fromkeys(restantes, 0)  # bitset dos dias em que o par já tem aula
+    limite = time.monotonic() + tempo_limite
+    solucao = []
+    for s in range(n_slots):
+        if not carga_turma:
+            break
+        if time.monotonic() > limite:
+            raise TempoEsgotado(f"Tempo limite de {tempo_limite:.0f}s esgotado.")
+
+        dia = 1 << (s // n_horarios)
+        for t, p in _emparelhar(restantes, carga_turma, carga_prof, n_slots - s, dias_par, dia):
+            solucao.append((t, p, s))
+            dias_par[(t, p)] |= dia
+            for d, k in ((restantes, (t, p)), (carga_turma, t), (carga_prof, p)):
+                d[k] -= 1
+                if not d[k]:
+                    del d[k]
+    return solucao
+
+
+def _emparelhar(restantes, carga_turma, carga_prof, k, dias_par, dia):
+    """
+    Emparelhamento para um slot cobrindo todos os vértices com carga == k.
+
+    Completa o grafo turma x professor até ficar k-regular: cada turma t
+    ganha uma cópia t' e cada professor p uma cópia p'; t liga a t' e p' a p
+    pelas folgas (k - carga), e p' liga a t' espelhando as arestas reais.
+    Grafo bipartido regular tem emparelhamento perfeito, e quem está sem
+    folga só pode casar por aresta real. As arestas reais vêm antes das de
+    folga na busca, para usar o slot ao máximo.
+    """
+    adj = {}
+    por_prof = {}
+    for (t, p), n in restantes.items():
+        adj.setdefault(("t", t), []).append(("p", p))
+        por_prof.setdefault(p, []).append(t)
+    for t, lista in list(adj.items()):
+        # Prefere pares que ainda não têm aula no dia e com mais aulas faltando.
+        lista.sort(key=lambda v: (bool(dias_par[(t[1], v[1])] & dia),
+                                  -restantes[(t[1], v[1])], -carga_prof[v[1]]))
+        if carga_turma[t[1]] < k:
+            lista.append(("t'", t[1]))
+    for p, turmas in por_prof.items():
+        lista = [("t'", t) for t in turmas]
+        if carga_prof[p] < k:
+            lista.insert(0, ("p", p))
+        adj[("p'", p)] = lista
+
+    par_de = {}  # vértice da direita -> vértice da esquerda
+
+    def aumentar(u, visitados):
+        for v in adj[u]:
+            if v in visitados:
+                continue
+            visitados.add(v)
+            if v not in par_de or aumentar(par_de[v], visitados):
+                par_de[v] = u
+                return True
+        return False
+
+    # Turmas sem folga primeiro: são as que precisam de aresta real.
+    esquerda = sorted(adj, key=lambda u: not (u[0] == "t" and carga_turma[u[1]] == k))
+    for u in esquerda:
+        if not aumentar(u, set()):
+            raise GradeInviavel("Não há grade possível para as cargas horárias atuais.")
+    return [(u[1], v[1]) for v, u in par_de.items() if v[0] == "p" and u[0] == "t"]
+
+
+def validar_horarios(horarios) -> None:
+    """
+    Cada Horário vira um período da grade, então eles não podem se sobrepor
+    (ex.: 08:00–12:00 e 08:00–09:00 deixariam o mesmo professor em dois lugares).
+    `horarios` deve vir ordenado por hora_inicio.
+    """
+    anterior = None
+    for h in horarios:
+        if h.hora_fim <= h.hora_inicio:
+            raise GradeInviavel(f"Horário inválido: {h.hora_inicio}–{h.hora_fim}.")
+        if anterior is not None and h.hora_inicio < anterior.hora_fim:
+            raise GradeInviavel(
+                f"Horários sobrepostos: {anterior.hora_inicio}–{anterior.hora_fim} e "
+                f"{h.hora_inicio}–{h.hora_fim}. Ajuste-os antes de gerar a grade."
+            )
+        anterior = h
+
+
+def gerar_grade(tempo_limite: float = 10.0) -> int:
+    """Resolve a grade a partir dos Horários e Cargas cadastrados e grava em grade_aulas."""
+    horarios = Horario.query.order_by(Horario.hora_inicio.asc(), Horario.hora_fim.asc()).all()
+    if not horarios:
+        raise GradeInviavel("Cadastre os horários antes de gerar a grade.")
+    validar_horarios(horarios)
+    cargas = [
+        (c.turma_id, c.professor_id, c.aulas_semanais)
+        for c in CargaHoraria.query.order_by(CargaHoraria.id.asc())
+    ]
+    solucao = resolver_grade(cargas, len(horarios), tempo_limite=tempo_limite)
+
+    n = len(horarios)
+    db.session.query(GradeAula).delete()
+    if solucao:
+        db.session.execute(
+            db.insert(GradeAula),
+            [
+                {"turma_id": t, "professor_id": p, "dia_semana": s // n, "horario_id": horarios[s % n].id}
+                for t, p, s in solucao
+            ],
+        )
+    db.session.commit()
+    return len(solucao)
@@ -1,5 +1,6 @@
 ﻿# models.py
 from datetime import datetime
+from typing import NamedTuple
 from werkzeug.security import generate_password_hash, check_password_hash
 from flask_login import UserMixin
 from extensions import db
@@ -14,9 +15,14 @@ class User(db.Model, UserMixin):
     name = db.Column(db.String(120), nullable=False)
     email = db.Column(db.String(120), unique=True, index=True, nullable=False)
     password_hash = db.Column(db.String(255), nullable=False)
-    role = db.Column(db.String(50), nullable=False, default=ROLE_COLABORADOR)
-    is_active = db.Column(db.Boolean, nullable=False, default=True)  # usado pelo Flask-Login
+    # active_history: contadores.py precisa do valor anterior mesmo com o atributo expirado
+    role = db.column_property(db.Column(db.String(50), nullable=False, default=ROLE_COLABORADOR), active_history=True)
+    is_active = db.column_property(db.Column(db.Boolean, nullable=False, default=True), active_history=True)  # usado pelo Flask-Login
     created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    # Controle otimista de concorrência: o UPDATE só vale se a versão não mudou
+    version_id = db.Column(db.Integer, nullable=False, default=1, server_default="1")
+
+    __mapper_args__ = {"version_id_col": version_id}
 
     def set_password(self, password: str) -> None:
         self.password_hash = generate_password_hash(password)
@@ -30,6 +36,30 @@ class User(db.Model, UserMixin):
     def __repr__(self) -> str:
         return f"<User {self.id} {self.email} ({self.role})>"
 
+class UserRow(NamedTuple):
+    """
+    Linha enxuta de usuário para listagens: só as colunas exibidas, sem
+    password_hash e sem passar pelo identity map da sessão.
+    """
+    id: int
+    name: str
+    email: str
+    role: str
+    is_active: bool
+    created_at: datetime
+
+    @property
+    def active(self) -> bool:  # nome usado pelos templates de cadastro
+        return self.is_active
+
+    @classmethod
+    def select(cls):
+        return db.select(*(getattr(User, f) for f in cls._fields))
+
+    @classmethod
+    def fetch(cls, stmt) -> list:
+        return [cls._make(r) for r in db.session.execute(stmt).tuples()]
+
 class Horario(db.Model):
     __tablename__ = "horarios"
 
@@ -38,6 +68,9 @@ class Horario(db.Model):
     hora_inicio = db.Column(db.String(5), nullable=False)  # "08:00"
     hora_fim = db.Column(db.String(5), nullable=False)     # "12:00"
     created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    version_id = db.Column(db.Integer, nullable=False, default=1, server_default="1")
+
+    __mapper_args__ = {"version_id_col": version_id}
 
     def __repr__(self) -> str:
         return f"<Horario {self.id} {self.hora_inicio}-{self.hora_fim}>"
@@ -46,9 +79,123 @@ class Mensalidade(db.Model):
     __tablename__ = "mensalidades"
 
     id = db.Column(db.Integer, primary_key=True)
+    # active_history: contadores.py precisa do valor anterior mesmo com o atributo expirado
+    serie = db.column_property(db.Column(db.String(120), nullable=False), active_history=True)
+    valor = db.column_property(db.Column(db.Numeric(10, 2), nullable=False), active_history=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    version_id = db.Column(db.Integer, nullable=False, default=1, server_default="1")
+
+    __mapper_args__ = {"version_id_col": version_id}
+
+    def __repr__(self) -> str:
+        return f"<Mensalidade {self.id} {self.serie} {self.valor}>"
+
+class Aluno(db.Model):
+    __tablename__ = "alunos"
+
+    id = db.Column(db.Integer, primary_key=True)
+    nome = db.Column(db.String(120), nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+    matriculas = db.relationship("Matricula", back_populates="aluno", lazy="dynamic")
+
+    def __repr__(self) -> str:
+        return f"<Aluno {self.id} {self.nome}>"
+
+class Matricula(db.Model):
+    __tablename__ = "matriculas"
+
+    id = db.Column(db.Integer, primary_key=True)
+    aluno_id = db.Column(db.Integer, db.ForeignKey("alunos.id"), nullable=False, index=True)
+    # Casa com Mensalidade.serie (texto livre, ex.: "1º Ano A")
+    serie = db.Column(db.String(120), nullable=False, index=True)
+    ativa = db.Column(db.Boolean, nullable=False, default=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+    aluno = db.relationship("Aluno", back_populates="matriculas")
+
+    def __repr__(self) -> str:
+        return f"<Matricula {self.id} aluno={self.aluno_id} {self.serie}>"
+
+class Cobranca(db.Model):
+    __tablename__ = "cobrancas"
+    # Uma cobrança por aluno por competência: garante idempotência da geração
+    # e serve de índice para as consultas por (aluno, mês).
+    __table_args__ = (
+        db.UniqueConstraint("aluno_id", "competencia", name="uq_cobrancas_aluno_competencia"),
+        db.Index("ix_cobrancas_competencia", "competencia"),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    aluno_id = db.Column(db.Integer, db.ForeignKey("alunos.id"), nullable=False)
+    matricula_id = db.Column(db.Integer, db.ForeignKey("matriculas.id"), nullable=False)
+    competencia = db.Column(db.String(7), nullable=False)  # "2025-03"
     serie = db.Column(db.String(120), nullable=False)
     valor = db.Column(db.Numeric(10, 2), nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
 
     def __repr__(self) -> str:
-        return f"<Mensalidade {self.id} {self.serie} {self.valor}>"
+        return f"<Cobranca {self.id} aluno={self.aluno_id} {self.competencia} {self.valor}>"
+
+class Turma(db.Model):
+    __tablename__ = "turmas"
+
+    id = db.Column(db.Integer, primary_key=True)
+    nome = db.Column(db.String(120), unique=True, nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<Turma {self.id} {self.nome}>"
+
+class CargaHoraria(db.Model):
+    """Quantas aulas por semana um professor dá numa turma."""
+    __tablename__ = "cargas_horarias"
+    __table_args__ = (
+        db.UniqueConstraint("turma_id", "professor_id", name="uq_cargas_turma_professor"),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    turma_id = db.Column(db.Integer, db.ForeignKey("turmas.id", ondelete="CASCADE"), nullable=False)
+    professor_id = db.Column(db.Integer, db.ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    aulas_semanais = db.Column(db.Integer, nullable=False)
+
+    turma = db.relationship("Turma")
+    professor = db.relationship("User")
+
+    def __repr__(self) -> str:
+        return f"<CargaHoraria turma={self.turma_id} prof={self.professor_id} {self.aulas_semanais}x>"
+
+class GradeAula(db.Model):
+    """Uma aula alocada na grade semanal (turma x professor x dia x horário)."""
+    __tablename__ = "grade_aulas"
+    __table_args__ = (
+        db.UniqueConstraint("turma_id", "dia_semana", "horario_id", name="uq_grade_turma_slot"),
+        db.UniqueConstraint("professor_id", "dia_semana", "horario_id", name="uq_grade_professor_slot"),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    turma_id = db.Column(db.Integer, db.ForeignKey("turmas.id", ondelete="CASCADE"), nullable=False)
+    professor_id = db.Column(db.Integer, db.ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    dia_semana = db.Column(db.Integer, nullable=False)  # 0 = segunda ... 4 = sexta
+    horario_id = db.Column(db.Integer, db.ForeignKey("horarios.id", ondelete="CASCADE"), nullable=False)
+
+    turma = db.relationship("Turma")
+    professor = db.relationship("User")
+    horario = db.relationship("Horario")
+
+    def __repr__(self) -> str:
+        return f"<GradeAula turma={self.turma_id} prof={self.professor_id} d{self.dia_semana} h{self.horario_id}>"
+
+class Contador(db.Model):
+    """
+    Totais do painel da home, mantidos incrementalmente (ver contadores.py).
+    Chaves: "horarios", "usuarios_ativos:<perfil>", "mensalidades_valor:<série>".
+    """
+    __tablename__ = "contadores"
+
+    chave = db.Column(db.String(200), primary_key=True)
+    valor = db.Column(db.Numeric(14, 2), nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<Contador {self.chave}={self.valor}>"
@@ -0,0 +1,8 @@
+# profiler/__init__.py
+from flask import Blueprint
+
+profiler_bp = Blueprint("profiler", __name__, url_prefix="/admin/perfis")
+
+# Importa rotas após criar o blueprint
+from . import routes  # noqa: E402,F401
+from .sampler import init_profiler  # noqa: E402,F401
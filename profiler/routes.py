@@ -0,0 +1,65 @@
+# profiler/routes.py
+import json
+import os
+from datetime import datetime
+
+from flask import render_template, current_app, send_from_directory, abort
+from flask_login import login_required, current_user
+
+from auth.utils import roles_required
+from models import ROLE_DIRETORIA
+from . import profiler_bp
+from .sampler import generate_profile_token, PROFILE_PARAM, PROFILE_HEADER, SUFIXO, SUFIXO_META
+
+
+def _listar_perfis(limite: int = 200):
+    pasta = current_app.config["PROFILER_DIR"]
+    try:
+        nomes = sorted((n for n in os.listdir(pasta) if n.endswith(SUFIXO)), reverse=True)
+    except FileNotFoundError:
+        return []
+    perfis = []
+    for nome in nomes[:limite]:
+        # Só o arquivo de metadados (pequeno) é lido; o perfil fica para o download.
+        try:
+            with open(os.path.join(pasta, nome[: -len(SUFIXO)] + SUFIXO_META), encoding="utf-8") as fp:
+                meta = json.load(fp)
+        except (OSError, ValueError):
+            meta = {}
+        sql = meta.get("sql", [])
+        criado = meta.get("created_at")
+        perfis.append({
+            "arquivo": nome,
+            "quando": datetime.fromisoformat(criado) if criado else None,
+            "method": meta.get("method"),
+            "path": meta.get("path"),
+            "duration_ms": meta.get("duration_ms"),
+            "sql_count": sum(s["count"] for s in sql),
+            "sql_ms": round(sum(s["total_ms"] for s in sql), 3),
+            "sql": sql[:10],
+        })
+    return perfis
+
+
+@profiler_bp.get("/")
+@login_required
+@roles_required(ROLE_DIRETORIA)
+def list_profiles():
+    return render_template(
+        "profiler/list.html",
+        perfis=_listar_perfis(),
+        token=generate_profile_token(current_user.id),
+        param=PROFILE_PARAM,
+        header=PROFILE_HEADER,
+        habilitado=current_app.config.get("PROFILER_ENABLED"),
+        sample_rate=current_app.config.get("PROFILER_SAMPLE_RATE", 0.0),
+    )
+
+
+@profiler_bp.get("/<path:arquivo>")
+@login_required
+@roles_required(ROLE_DIRETORIA)
+def download_profile(arquivo):
+    if not arquivo.endswith(SUFIXO):
+        abort(404)
+    return send_from_directory(current_app.config["PROFILER_DIR"], arquivo, as_attachment=True)
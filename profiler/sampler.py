@@ -0,0 +1,224 @@
+# profiler/sampler.py
+import json
+import os
+import random
+import re
+import sys
+import threading
+import time
+from datetime import datetime
+
+from flask import current_app, g, request
+from flask_login import current_user
+from itsdangerous import URLSafeTimedSerializer, BadSignature, SignatureExpired
+from sqlalchemy import event
+
+from extensions import db
+from models import ROLE_DIRETORIA
+
+PROFILE_PARAM = "_profile"
+PROFILE_HEADER = "X-Profile-Token"
+SUFIXO = ".speedscope.json"
+SUFIXO_META = ".meta.json"   # metadados + SQL, lidos pela página de perfis
+
+
+# ---- token assinado (habilita o perfil por requisição) ----
+def _serializer():
+    secret = current_app.config.get("SECRET_KEY")
+    return URLSafeTimedSerializer(secret_key=secret, salt="school-profiler")
+
+
+def generate_profile_token(user_id: int) -> str:
+    return _serializer().dumps(user_id)
+
+
+def verify_profile_token(token: str, max_age: int = 3600):
+    try:
+        return _serializer().loads(token, max_age=max_age)
+    except (SignatureExpired, BadSignature):
+        return None
+
+
+# ---- amostrador ----
+class Sampler:
+    """
+    Amostra a pilha de uma thread a cada `interval` segundos a partir de uma
+    thread auxiliar (sys._current_frames). Pilhas iguais são agregadas.
+    """
+
+    def __init__(self, thread_id: int, interval: float = 0.001):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = {}
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="school-profiler", daemon=True)
+
+    def start(self):
+        self.started = time.perf_counter()
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+        self.elapsed = time.perf_counter() - self.started
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append((code.co_name, code.co_filename, code.co_firstlineno))
+                frame = frame.f_back
+            if stack:
+                key = tuple(reversed(stack))
+                self.stacks[key] = self.stacks.get(key, 0) + 1
+
+
+class SqlRecorder:
+    """Tempo e contagem por comando SQL executado na thread da requisição."""
+
+    def __init__(self, engine, thread_id: int):
+        self.engine = engine
+        self.thread_id = thread_id
+        self.statements = {}
+        self._inicio = {}
+
+    def _before(self, conn, cursor, statement, parameters, context, executemany):
+        if threading.get_ident() == self.thread_id:
+            self._inicio[id(cursor)] = time.perf_counter()
+
+    def _after(self, conn, cursor, statement, parameters, context, executemany):
+        t0 = self._inicio.pop(id(cursor), None)
+        if t0 is None:
+            return
+        item = self.statements.setdefault(statement, [0, 0.0])
+        item[0] += 1
+        item[1] += time.perf_counter() - t0
+
+    def start(self):
+        event.listen(self.engine, "before_cursor_execute", self._before)
+        event.listen(self.engine, "after_cursor_execute", self._after)
+
+    def stop(self):
+        event.remove(self.engine, "before_cursor_execute", self._before)
+        event.remove(self.engine, "after_cursor_execute", self._after)
+
+    def resumo(self):
+        itens = [
+            {"statement": s, "count": n, "total_ms": round(t * 1000, 3)}
+            for s, (n, t) in self.statements.items()
+        ]
+        return sorted(itens, key=lambda i: i["total_ms"], reverse=True)
+
+
+def to_speedscope(sampler: Sampler, name: str) -> dict:
+    frames, indices = [], {}
+    samples, weights = [], []
+    interval_ms = sampler.interval * 1000
+    for stack, count in sampler.stacks.items():
+        linha = []
+        for f in stack:
+            if f not in indices:
+                indices[f] = len(frames)
+                frames.append({"name": f[0], "file": f[1], "line": f[2]})
+            linha.append(indices[f])
+        samples.append(linha)
+        weights.append(count * interval_ms)
+    return {
+        "$schema": "https://www.speedscope.app/file-format-schema.json",
+        "name": name,
+        "exporter": "school",
+        "shared": {"frames": frames},
+        "profiles": [{
+            "type": "sampled",
+            "name": name,
+            "unit": "milliseconds",
+            "startValue": 0,
+            "endValue": sum(weights),
+            "samples": samples,
+            "weights": weights,
+        }],
+    }
+
+
+# ---- hooks da aplicação ----
+def _estatico() -> bool:
+    endpoint = request.endpoint
+    return endpoint is None or endpoint == "static" or endpoint.endswith(".static")
+
+
+def _deve_perfilar() -> bool:
+    rate = current_app.config.get("PROFILER_SAMPLE_RATE", 0.0)
+    if rate and not _estatico() and random.random() < rate:
+        return True
+    token = request.args.get(PROFILE_PARAM) or request.headers.get(PROFILE_HEADER)
+    if not token:
+        return False
+    if not current_user.is_authenticated or current_user.role != ROLE_DIRETORIA:
+        return False
+    return verify_profile_token(token) == current_user.id
+
+
+def _iniciar():
+    if not _deve_perfilar():
+        return
+    tid = threading.get_ident()
+    g._profiler = Sampler(tid, current_app.config.get("PROFILER_INTERVAL", 0.001))
+    g._profiler_sql = SqlRecorder(db.engine, tid)
+    g._profiler_sql.start()
+    g._profiler.start()
+
+
+def _finalizar(exc):
+    sampler = g.pop("_profiler", None)
+    if sampler is None:
+        return
+    sampler.stop()
+    sql = g.pop("_profiler_sql")
+    sql.stop()
+
+    meta = {
+        "method": request.method,
+        "path": request.path,
+        "endpoint": request.endpoint,
+        "duration_ms": round(sampler.elapsed * 1000, 3),
+        "created_at": datetime.utcnow().isoformat(),
+        "error": repr(exc) if exc else None,
+    }
+    nome = f"{request.method} {request.path}"
+    slug = re.sub(r"[^A-Za-z0-9]+", "-", request.path).strip("-") or "root"
+    base = f"{datetime.utcnow():%Y%m%d-%H%M%S-%f}-{request.method}-{slug}"
+    pasta = current_app.config["PROFILER_DIR"]
+    try:
+        os.makedirs(pasta, exist_ok=True)
+        with open(os.path.join(pasta, base + SUFIXO), "w", encoding="utf-8") as fp:
+            json.dump(to_speedscope(sampler, nome), fp)
+        with open(os.path.join(pasta, base + SUFIXO_META), "w", encoding="utf-8") as fp:
+            json.dump(dict(meta, sql=sql.resumo()[:20]), fp)
+        _limpar(pasta, current_app.config.get("PROFILER_MAX_FILES", 200))
+    except OSError:
+        current_app.logger.exception("Falha ao gravar perfil %s", base)
+
+
+def _limpar(pasta: str, maximo: int) -> None:
+    """Mantém só os `maximo` perfis mais recentes (os nomes começam pela data)."""
+    perfis = sorted(n for n in os.listdir(pasta) if n.endswith(SUFIXO))
+    for nome in perfis[:max(len(perfis) - maximo, 0)]:
+        base = nome[: -len(SUFIXO)]
+        for arquivo in (nome, base + SUFIXO_META):
+            try:
+                os.remove(os.path.join(pasta, arquivo))
+            except FileNotFoundError:
+                pass
+
+
+def init_profiler(app):
+    """
+    Registra os hooks do profiler. Com PROFILER_ENABLED desligado nada é
+    registrado, então o custo por requisição é zero.
+    """
+    if not app.config.get("PROFILER_ENABLED"):
+        return
+    app.before_request(_iniciar)
+    app.teardown_request(_finalizar)
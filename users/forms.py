@@ -1,6 +1,6 @@
 # users/forms.py
 from flask_wtf import FlaskForm
-from wtforms import StringField, PasswordField, SubmitField, SelectField, BooleanField
+from wtforms import StringField, PasswordField, SubmitField, SelectField, BooleanField, HiddenField
 from wtforms.validators import DataRequired, Email, EqualTo, Regexp, ValidationError
 from models import User
 from extensions import db
@@ -30,6 +30,7 @@ class UserEditForm(FlaskForm):
     email = StringField("Email", validators=[DataRequired(), Email()])
     role = SelectField("Perfil", choices=ROLE_CHOICES, validators=[DataRequired()])
     is_active = BooleanField("Ativo")
+    version_id = HiddenField()
     submit = SubmitField("Salvar")
 
     def __init__(self, original_email=None, *args, **kwargs):
@@ -1,9 +1,10 @@
 # users/routes.py
 from flask import render_template, request, redirect, url_for, flash, abort
 from flask_login import login_required, current_user
-from sqlalchemy import select
+from sqlalchemy.orm.exc import StaleDataError
 from extensions import db
-from models import User
+from models import User, UserRow
+from concorrencia import versao_enviada, render_conflito
 from .forms import UserCreateForm, UserEditForm, PasswordChangeForm, DeleteForm
 from . import users_bp
 from auth.utils import roles_required  # já existente no seu projeto (Diretoria-only)
@@ -12,7 +13,7 @@ from auth.utils import roles_required  # já existente no seu projeto (Diretoria
 @login_required
 @roles_required("Diretoria")
 def list_users():
-    users = db.session.scalars(select(User).order_by(User.created_at.desc())).all()
+    users = UserRow.fetch(UserRow.select().order_by(User.created_at.desc()))
     delete_form = DeleteForm()
     return render_template("users/list.html", users=users, delete_form=delete_form)
 
@@ -38,11 +39,24 @@ def edit_user(user_id):
     user = db.session.get(User, user_id) or abort(404)
     form = UserEditForm(original_email=user.email, obj=user)
     if form.validate_on_submit():
+        def conflito():
+            return render_conflito("Editar Usuário", [
+                ("Email", form.email.data, user.email),
+                ("Perfil", form.role.data, user.role),
+                ("Ativo", bool(form.is_active.data), user.is_active),
+            ], user.version_id, url_for("users.edit_user", user_id=user_id))
+
+        if versao_enviada(form.version_id.data) != user.version_id:
+            return conflito()
         # Mantemos email como eventual atualização validada; no template deixamos readonly
         user.email = form.email.data.strip().lower()
         user.role = form.role.data
         user.is_active = bool(form.is_active.data)
-        db.session.commit()
+        try:
+            db.session.commit()
+        except StaleDataError:
+            db.session.rollback()
+            return conflito()
         flash("Usuário atualizado com sucesso.", "success")
         return redirect(url_for("users.list_users"))
     # Preenche defaults